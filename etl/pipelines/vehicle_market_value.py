@@ -6,21 +6,83 @@ transforms into curated schema, and loads aggregates into RDS.
 
 from __future__ import annotations
 
-import json
+import functools
+import hashlib
 import logging
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 
 import boto3
-import requests
+import orjson
+import pyarrow as pa
+import pyarrow.parquet as pq
+import urllib3
 import yaml
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import ClientError
+from urllib3.exceptions import HTTPError
+from urllib3.util import Retry
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader
 
 LOGGER = logging.getLogger(__name__)
 
+MAX_FETCH_WORKERS = 32
+
+RAPIDAPI_HOST = "vehicle-market-value.p.rapidapi.com"
+
+SOURCE_NAME = "vehicle_market_value_api"
+
+SECRET_TTL_SECONDS = 900
+# (region, secret name) -> (monotonic expiry, API key); lets long-lived workers skip GetSecretValue.
+_SECRET_CACHE: Dict[Tuple[str, str], Tuple[float, str]] = {}
+
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 ** 2,
+    multipart_chunksize=8 * 1024 ** 2,
+    max_concurrency=10,
+    use_threads=True,
+)
+
+CURATED_SPOOL_BYTES = 32 * 1024 ** 2
+
+CURATED_SCHEMA = pa.schema([
+    ("plate", pa.string()),
+    ("year", pa.int64()),
+    ("make", pa.string()),
+    ("model", pa.string()),
+    ("trim", pa.string()),
+    ("mileage", pa.int64()),
+    ("condition", pa.string()),
+    ("retail_value", pa.float64()),
+    ("wholesale_value", pa.float64()),
+    ("trade_in_value", pa.float64()),
+    ("timestamp", pa.string()),
+    ("source", pa.string()),
+])
 
-@dataclass
+PAYLOAD_FIELDS = ("year", "make", "model", "trim", "mileage", "condition")
+
+# valuation key in the API payload -> curated column
+VALUATION_FIELDS = (
+    ("retail", "retail_value"),
+    ("wholesale", "wholesale_value"),
+    ("trade_in", "trade_in_value"),
+)
+
+_CAST_ERRORS = (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError, TypeError, ValueError, OverflowError)
+
+
+@dataclass(frozen=True, slots=True)
 class PipelineConfig:
     environment: str
     region: str
@@ -29,7 +91,7 @@ class PipelineConfig:
     max_attempts: int
     backoff_seconds: int
     default_state: str
-    plates: List[str]
+    plates: Tuple[str, ...]
     raw_bucket: str
     curated_bucket: str
     raw_prefix: str
@@ -43,8 +105,15 @@ class PipelineConfig:
 
 
 def load_config(path: str = "etl/config/base.yaml") -> PipelineConfig:
+    resolved = os.path.abspath(path)
+    stat = os.stat(resolved)
+    return _load_config_cached(resolved, stat.st_mtime_ns, stat.st_size)
+
+
+@functools.lru_cache(maxsize=100)
+def _load_config_cached(path: str, mtime_ns: int, size: int) -> PipelineConfig:
     with open(path, "r", encoding="utf-8") as handle:
-        data = yaml.safe_load(handle)
+        data = yaml.load(handle, Loader=SafeLoader)
     run = data["run"]
     source = data["sources"]["vehicle_market_value"]
     storage = data["storage"]
@@ -57,7 +126,7 @@ def load_config(path: str = "etl/config/base.yaml") -> PipelineConfig:
         max_attempts=source["retries"]["max_attempts"],
         backoff_seconds=source["retries"]["backoff_seconds"],
         default_state=source["default_state"],
-        plates=source["plates"],
+        plates=tuple(source["plates"]),
         raw_bucket=storage["raw_bucket"],
         curated_bucket=storage["curated_bucket"],
         raw_prefix=storage["prefix"]["raw"],
@@ -75,66 +144,109 @@ class VehicleMarketPipeline:
     def __init__(self, config: PipelineConfig):
         session = boto3.Session(region_name=config.region)
         self.secrets = session.client("secretsmanager")
-        self.s3 = session.client("s3")
+        # Raw uploads come from every fetch worker, so size the connection pool to match.
+        self.s3 = session.client("s3", config=Config(max_pool_connections=MAX_FETCH_WORKERS))
+        self.http = _build_http_pool(config)
         self.config = config
 
     def run(self) -> None:
         LOGGER.info("Starting vehicle market value pipeline")
-        api_key = self._get_secret(self.config.secret_name)
-        records = []
-        for plate in self.config.plates:
-            payload = self._fetch_vehicle_value(api_key, plate, self.config.default_state)
-            records.append(self._normalize_payload(plate, payload))
-            self._write_raw(plate, payload)
-        curated = self._to_curated(records)
-        self._write_curated(curated)
-        LOGGER.info("Pipeline completed with %d records", len(curated))
+        headers = {"x-rapidapi-host": RAPIDAPI_HOST, "x-rapidapi-key": self._get_secret(self.config.secret_name)}
+        now = datetime.now(timezone.utc)
+        timestamp = now.isoformat()
+        plates = self.config.plates
+        ingest = functools.partial(self._ingest_plate, headers, state=self.config.default_state, timestamp=timestamp)
+        with ThreadPoolExecutor(max_workers=max(1, min(MAX_FETCH_WORKERS, len(plates)))) as pool:
+            # map yields results in config.plates order, keeping the curated rows deterministic.
+            payloads = list(pool.map(ingest, plates))
+        curated = self._to_curated(list(plates), payloads, timestamp)
+        # Release the raw payloads so they can be collected during the upload.
+        del payloads
+        self._write_curated(curated, now.strftime("%Y/%m/%d"))
+        LOGGER.info("Pipeline completed with %d records", curated.num_rows)
 
     def _get_secret(self, name: str) -> str:
+        cache_key = (self.config.region, name)
+        cached = _SECRET_CACHE.get(cache_key)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
         response = self.secrets.get_secret_value(SecretId=name)
         secret_string = response.get("SecretString")
         if not secret_string:
             raise ValueError(f"Secret {name} missing SecretString")
-        return json.loads(secret_string)["x-rapidapi-key"]
-
-    def _fetch_vehicle_value(self, api_key: str, plate: str, state: str) -> Dict[str, Any]:
-        headers = {
-            "x-rapidapi-host": "vehicle-market-value.p.rapidapi.com",
-            "x-rapidapi-key": api_key,
-        }
-        params = {"license_plate": plate, "state_code": state}
-        response = requests.get(self.config.endpoint, headers=headers, params=params, timeout=10)
-        response.raise_for_status()
-        return response.json()
-
-    def _write_raw(self, plate: str, payload: Dict[str, Any]) -> None:
-        key = f"{self.config.raw_prefix}/{plate}/{datetime.now(timezone.utc).isoformat()}.json"
-        self.s3.put_object(Bucket=self.config.raw_bucket, Key=key, Body=json.dumps(payload))
-
-    def _normalize_payload(self, plate: str, payload: Dict[str, Any]) -> Dict[str, Any]:
-        valuation = payload.get("valuation", {})
-        return {
-            "plate": plate,
-            "year": payload.get("year"),
-            "make": payload.get("make"),
-            "model": payload.get("model"),
-            "trim": payload.get("trim"),
-            "mileage": payload.get("mileage"),
-            "condition": payload.get("condition"),
-            "retail_value": valuation.get("retail"),
-            "wholesale_value": valuation.get("wholesale"),
-            "trade_in_value": valuation.get("trade_in"),
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "source": "vehicle_market_value_api",
-        }
-
-    def _to_curated(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        return records
-
-    def _write_curated(self, records: List[Dict[str, Any]]) -> None:
-        key = f"{self.config.curated_prefix}/{datetime.now(timezone.utc).strftime('%Y/%m/%d')}/vehicles.json"
-        body = json.dumps(records)
-        self.s3.put_object(Bucket=self.config.curated_bucket, Key=key, Body=body)
+        api_key = orjson.loads(secret_string)["x-rapidapi-key"]
+        _SECRET_CACHE[cache_key] = (time.monotonic() + SECRET_TTL_SECONDS, api_key)
+        return api_key
+
+    def _ingest_plate(self, headers: Dict[str, str], plate: str, state: str, timestamp: str) -> Dict[str, Any]:
+        payload = self._fetch_vehicle_value(headers, plate, state)
+        self._write_raw(plate, payload, timestamp)
+        return payload
+
+    def _fetch_vehicle_value(self, headers: Dict[str, str], plate: str, state: str) -> Dict[str, Any]:
+        fields = {"license_plate": plate, "state_code": state}
+        response = self.http.request("GET", self.config.endpoint, fields=fields, headers=headers, timeout=10.0)
+        if response.status >= 400:
+            raise HTTPError(f"Vehicle market value lookup for {plate} failed with HTTP {response.status}")
+        return orjson.loads(response.data)
+
+    def _write_raw(self, plate: str, payload: Dict[str, Any], timestamp: str) -> None:
+        # A short hash ahead of the plate spreads writes across S3 key-prefix partitions.
+        shard = hashlib.blake2b(plate.encode("utf-8"), digest_size=2).hexdigest()
+        key = f"{self.config.raw_prefix}/{shard}/{plate}/{timestamp}.json"
+        # Raw payloads are a few hundred bytes; a transfer manager per object would only add overhead.
+        self.s3.put_object(Bucket=self.config.raw_bucket, Key=key, Body=orjson.dumps(payload))
+
+    def _to_curated(self, plates: List[str], payloads: List[Dict[str, Any]], timestamp: str) -> pa.Table:
+        valuations = [_as_mapping(payload.get("valuation")) for payload in payloads]
+        columns = {"plate": pa.array(plates, type=pa.string())}
+        for field in PAYLOAD_FIELDS:
+            columns[field] = _to_column(field, [payload.get(field) for payload in payloads])
+        for source, column in VALUATION_FIELDS:
+            columns[column] = _to_column(column, [valuation.get(source) for valuation in valuations])
+        rows = len(payloads)
+        columns["timestamp"] = pa.repeat(pa.scalar(timestamp), rows)
+        columns["source"] = pa.repeat(pa.scalar(SOURCE_NAME), rows)
+        return pa.Table.from_pydict(columns, schema=CURATED_SCHEMA)
+
+    def _write_curated(self, table: pa.Table, day: str) -> None:
+        key = f"{self.config.curated_prefix}/{day}/vehicles.parquet"
+        # Small runs stay in memory; larger ones spill to disk instead of holding the whole file in RAM.
+        with tempfile.SpooledTemporaryFile(max_size=CURATED_SPOOL_BYTES) as body:
+            pq.write_table(table, body, compression="zstd")
+            body.seek(0)
+            self.s3.upload_fileobj(body, self.config.curated_bucket, key, Config=TRANSFER_CONFIG)
+
+
+def _as_mapping(value: Any) -> Dict[str, Any]:
+    return value if isinstance(value, dict) else {}
+
+
+def _to_column(name: str, values: List[Any]) -> pa.Array:
+    """Convert API values to the curated column type, nulling (and logging) anything that can't be cast losslessly."""
+    target = CURATED_SCHEMA.field(name).type
+    try:
+        # Fast path: the whole column infers and casts in Arrow; safe=True rejects truncation such as 1.5 -> 1.
+        return pa.array(values).cast(target, safe=True)
+    except _CAST_ERRORS:
+        pass
+    coerced = []
+    for value in values:
+        try:
+            coerced.append(pa.array([value]).cast(target, safe=True)[0].as_py())
+        except _CAST_ERRORS:
+            LOGGER.warning("Dropping %s value %r: not convertible to %s", name, value, target)
+            coerced.append(None)
+    return pa.array(coerced, type=target)
+
+
+def _build_http_pool(config: PipelineConfig) -> urllib3.PoolManager:
+    retry = Retry(
+        total=config.max_attempts - 1,
+        backoff_factor=config.backoff_seconds,
+        status_forcelist=[429, 502, 503, 504],
+    )
+    return urllib3.PoolManager(num_pools=1, maxsize=MAX_FETCH_WORKERS, retries=retry)
 
 
 def main(config_path: str = "etl/config/base.yaml") -> None:
@@ -1,9 +1,20 @@
+import dataclasses
 import json
+import time
+from types import SimpleNamespace
 from unittest import mock
 
+import pyarrow as pa
+import pyarrow.parquet as pq
 import pytest
 
-from etl.pipelines.vehicle_market_value import VehicleMarketPipeline, PipelineConfig
+from etl.pipelines import vehicle_market_value
+from etl.pipelines.vehicle_market_value import VehicleMarketPipeline, PipelineConfig, load_config
+
+
+@pytest.fixture(autouse=True)
+def clear_secret_cache():
+    vehicle_market_value._SECRET_CACHE.clear()
 
 
 @pytest.fixture
@@ -16,7 +27,7 @@ def config() -> PipelineConfig:
         max_attempts=3,
         backoff_seconds=1,
         default_state="AL",
-        plates=["S8TAN"],
+        plates=("S8TAN",),
         raw_bucket="raw",
         curated_bucket="curated",
         raw_prefix="raw_prefix",
@@ -30,27 +41,160 @@ def config() -> PipelineConfig:
     )
 
 
-@mock.patch("etl.pipelines.vehicle_market_value.requests.get")
-@mock.patch("etl.pipelines.vehicle_market_value.boto3.Session")
-def test_pipeline_run(mock_session, mock_get, config):
+@pytest.fixture
+def aws():
+    """Patch the boto3 session and HTTP pool used by VehicleMarketPipeline and expose the fakes."""
     secrets_client = mock.Mock()
     secrets_client.get_secret_value.return_value = {"SecretString": json.dumps({"x-rapidapi-key": "key"})}
     s3_client = mock.Mock()
-    session_instance = mock.Mock()
-    session_instance.client.side_effect = [secrets_client, s3_client]
-    mock_session.return_value = session_instance
+    uploads = {}
+    s3_client.upload_fileobj.side_effect = lambda body, bucket, key, Config: uploads.update({(bucket, key): body.read()})
+    with mock.patch("etl.pipelines.vehicle_market_value.boto3.Session") as mock_session, \
+            mock.patch("etl.pipelines.vehicle_market_value.urllib3.PoolManager") as mock_pool:
+        mock_session.return_value.client.side_effect = [secrets_client, s3_client]
+        yield SimpleNamespace(
+            session=mock_session.return_value,
+            secrets=secrets_client,
+            s3=s3_client,
+            uploads=uploads,
+            request=mock_pool.return_value.request,
+        )
+
+
+def _curated_rows(uploads):
+    key, body = next((key, body) for (bucket, key), body in uploads.items() if bucket == "curated")
+    assert key.endswith("/vehicles.parquet")
+    return pq.read_table(pa.BufferReader(body)).to_pylist()
 
-    mock_get.return_value.json.return_value = {
+
+def test_pipeline_run(aws, config):
+    aws.request.return_value.status = 200
+    aws.request.return_value.data = json.dumps({
         "year": 2020,
         "make": "Tesla",
         "model": "Model 3",
         "valuation": {"retail": 50000},
-    }
-    mock_get.return_value.raise_for_status.return_value = None
+    }).encode("utf-8")
+
+    pipeline = VehicleMarketPipeline(config)
+    pipeline.run()
+
+    aws.request.assert_called_once()
+    assert aws.request.call_args.kwargs["headers"]["x-rapidapi-key"] == "key"
+    s3_config = aws.session.client.call_args_list[1].kwargs["config"]
+    assert s3_config.max_pool_connections == vehicle_market_value.MAX_FETCH_WORKERS
+    aws.s3.put_object.assert_called_once()
+    assert aws.s3.put_object.call_args.kwargs["Bucket"] == "raw"
+    assert json.loads(aws.s3.put_object.call_args.kwargs["Body"])["make"] == "Tesla"
+    assert aws.s3.upload_fileobj.call_count == 1
+    raw_key = aws.s3.put_object.call_args.kwargs["Key"]
+    prefix, shard, plate, _ = raw_key.split("/")
+    assert (prefix, plate) == ("raw_prefix", "S8TAN")
+    assert len(shard) == 4
+    rows = _curated_rows(aws.uploads)
+    assert rows[0]["plate"] == "S8TAN"
+    assert rows[0]["make"] == "Tesla"
+    assert rows[0]["retail_value"] == 50000
+    assert rows[0]["mileage"] is None
 
+
+def test_pipeline_run_fetches_every_plate(aws, config):
+    def respond(method, url, fields, headers, timeout):
+        if fields["license_plate"] == "S8TAN":
+            time.sleep(0.05)  # first plate finishes last; curated order must still follow config
+        return mock.Mock(status=200, data=json.dumps({"make": fields["license_plate"]}).encode("utf-8"))
+
+    aws.request.side_effect = respond
+
+    config = dataclasses.replace(config, plates=("S8TAN", "TEST123", "ABC999"))
     pipeline = VehicleMarketPipeline(config)
     pipeline.run()
 
-    mock_get.assert_called_once()
-    assert s3_client.put_object.call_count == 2
+    fetched = sorted(call.kwargs["fields"]["license_plate"] for call in aws.request.call_args_list)
+    assert fetched == ["ABC999", "S8TAN", "TEST123"]
+    assert aws.s3.put_object.call_count == 3
+    assert aws.s3.upload_fileobj.call_count == 1
+    rows = _curated_rows(aws.uploads)
+    assert [row["plate"] for row in rows] == ["S8TAN", "TEST123", "ABC999"]
+    assert [row["make"] for row in rows] == ["S8TAN", "TEST123", "ABC999"]
+
+
+def test_load_config_reuses_parse_until_file_changes(tmp_path):
+    source = tmp_path / "base.yaml"
+    source.write_text(open("etl/config/base.yaml", encoding="utf-8").read(), encoding="utf-8")
+
+    first = load_config(str(source))
+    assert load_config(str(source)) is first
+
+    source.write_text(source.read_text(encoding="utf-8").replace("S8TAN", "NEW1"), encoding="utf-8")
+    reloaded = load_config(str(source))
+    assert reloaded is not first
+    assert reloaded.plates[0] == "NEW1"
+
+
+def test_to_curated_tolerates_missing_fields(aws, config):
+    pipeline = VehicleMarketPipeline(config)
+
+    table = pipeline._to_curated(
+        ["S8TAN", "TEST123"],
+        [{"make": "Tesla", "valuation": None, "unexpected": [1]}, {"year": 2019, "valuation": {"trade_in": 900}}],
+        "2024-01-01T00:00:00+00:00",
+    )
+
+    rows = table.to_pylist()
+    assert rows[0]["plate"] == "S8TAN"
+    assert rows[0]["make"] == "Tesla"
+    assert rows[0]["retail_value"] is None
+    assert rows[1]["year"] == 2019
+    assert rows[1]["trade_in_value"] == 900
+    assert {row["timestamp"] for row in rows} == {"2024-01-01T00:00:00+00:00"}
+    assert {row["source"] for row in rows} == {"vehicle_market_value_api"}
+
+
+def test_get_secret_is_cached_until_ttl_expires(aws, config):
+    pipeline = VehicleMarketPipeline(config)
+
+    with mock.patch("etl.pipelines.vehicle_market_value.time.monotonic", return_value=1000.0):
+        assert pipeline._get_secret("test/secret") == "key"
+        assert pipeline._get_secret("test/secret") == "key"
+    assert aws.secrets.get_secret_value.call_count == 1
+
+    with mock.patch("etl.pipelines.vehicle_market_value.time.monotonic", return_value=1000.0 + 901):
+        pipeline._get_secret("test/secret")
+    assert aws.secrets.get_secret_value.call_count == 2
+
+
+def test_to_curated_coerces_loosely_typed_values(aws, config, caplog):
+    pipeline = VehicleMarketPipeline(config)
+
+    table = pipeline._to_curated(
+        ["S8TAN", "TEST123"],
+        [
+            {"year": "2020", "mileage": 45000.5, "valuation": {"retail": "50000"}},
+            {"year": 2019, "mileage": 1200, "valuation": "n/a"},
+        ],
+        "2024-01-01T00:00:00+00:00",
+    )
+
+    rows = table.to_pylist()
+    assert [row["year"] for row in rows] == [2020, 2019]
+    assert rows[0]["retail_value"] == 50000.0
+    assert rows[1]["retail_value"] is None
+    # A fractional mileage can't be stored losslessly as int64, so it is nulled and logged rather than truncated.
+    assert [row["mileage"] for row in rows] == [None, 1200]
+    assert "45000.5" in caplog.text
+
+
+def test_to_curated_nulls_out_of_range_integers(aws, config, caplog):
+    pipeline = VehicleMarketPipeline(config)
+
+    table = pipeline._to_curated(
+        ["S8TAN", "TEST123"],
+        [{"year": 2**64 - 1, "mileage": 2**63}, {"year": 2019, "mileage": 1200}],
+        "2024-01-01T00:00:00+00:00",
+    )
 
+    rows = table.to_pylist()
+    assert [row["year"] for row in rows] == [None, 2019]
+    assert [row["mileage"] for row in rows] == [None, 1200]
+    assert str(2**64 - 1) in caplog.text
@@ -13,43 +13,105 @@ Guardrails applied:
 from __future__ import annotations
 
 import base64
+import copy
+import functools
 import logging
 import os
+import random
+import tempfile
+import threading
 import time
+from concurrent.futures import FIRST_EXCEPTION, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import boto3
 import botocore
+import orjson
 import yaml
 from botocore.exceptions import ClientError
 from rich.console import Console
 from rich.table import Table
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader
+
 LOGGER = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
 
 console = Console()
 
+PROVISIONING_WORKERS = 8
+
+KNOWN_BUCKETS_PATH = os.path.join(os.path.expanduser("~"), ".cache", "infra_deployer", "known_buckets.json")
+KNOWN_BUCKETS_TTL_SECONDS = 3600
+
+SECRET_TTL_SECONDS = 900
+# (region, secret name) -> (monotonic expiry, parsed secret); shared by every SecretsManager in the process.
+_SECRET_CACHE: Dict[Tuple[str, str], Tuple[float, Dict[str, Any]]] = {}
+
 
 def load_config(path: str) -> Dict[str, Any]:
-    with open(path, "r", encoding="utf-8") as handle:
-        return yaml.safe_load(handle)
+    resolved = os.path.abspath(path)
+    stat = os.stat(resolved)
+    return copy.deepcopy(_load_config_cached(resolved, stat.st_mtime_ns, stat.st_size))
 
 
-def retryable(func):
-    def wrapper(*args, **kwargs):
-        attempts = kwargs.pop("max_attempts", 5)
-        delay = kwargs.pop("backoff_seconds", 2)
-        for attempt in range(1, attempts + 1):
-            try:
-                return func(*args, **kwargs)
-            except ClientError as exc:
-                if attempt == attempts:
-                    raise
-                LOGGER.warning("%s failed (attempt %d/%d): %s", func.__name__, attempt, attempts, exc)
-                time.sleep(delay * attempt)
-    return wrapper
+@functools.lru_cache(maxsize=100)
+def _load_config_cached(path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as handle:
+        return yaml.load(handle, Loader=SafeLoader)
+
+
+RETRYABLE_ERROR_CODES = frozenset({
+    "Throttling",
+    "ThrottlingException",
+    "ThrottledException",
+    "RequestLimitExceeded",
+    "RequestThrottled",
+    "RequestThrottledException",
+    "TooManyRequestsException",
+    "ProvisionedThroughputExceededException",
+    "SlowDown",
+    "InternalError",
+    "InternalFailure",
+    "ServiceUnavailable",
+    "Unavailable",
+    # EC2 is eventually consistent: a resource that was just created can briefly be reported as missing.
+    "InvalidVpcID.NotFound",
+    "InvalidSubnetID.NotFound",
+    "InvalidInternetGatewayID.NotFound",
+    "InvalidRouteTableID.NotFound",
+    "InvalidGroup.NotFound",
+    "InvalidAllocationID.NotFound",
+    "InvalidNatGatewayID.NotFound",
+})
+
+
+def _is_retryable(exc: ClientError) -> bool:
+    if exc.response.get("Error", {}).get("Code") in RETRYABLE_ERROR_CODES:
+        return True
+    return exc.response.get("ResponseMetadata", {}).get("HTTPStatusCode", 0) >= 500
+
+
+def retryable(max_attempts: int = 5, base: float = 0.5, cap: float = 20):
+    """Retry throttling and 5xx ClientErrors with capped exponential backoff plus jitter."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            for attempt in range(1, max_attempts + 1):
+                try:
+                    return func(*args, **kwargs)
+                except ClientError as exc:
+                    if attempt == max_attempts or not _is_retryable(exc):
+                        raise
+                    delay = min(cap, base * (2 ** (attempt - 1))) + random.uniform(0, 0.1)
+                    LOGGER.warning("%s failed (attempt %d/%d), retrying in %.2fs: %s", func.__name__, attempt, max_attempts, delay, exc)
+                    time.sleep(delay)
+        return wrapper
+    return decorator
 
 
 @dataclass
@@ -60,6 +122,7 @@ class AWSClients:
     s3: Any
     iam: Any
     secretsmanager: Any
+    sts: Any
 
 
 def init_clients(region: str) -> AWSClients:
@@ -71,14 +134,22 @@ def init_clients(region: str) -> AWSClients:
         s3=session.client("s3"),
         iam=session.client("iam"),
         secretsmanager=session.client("secretsmanager"),
+        sts=session.client("sts"),
     )
 
 
 class VPCManager:
     def __init__(self, ec2):
         self.ec2 = ec2
+        self._subnets: Dict[Tuple[str, str], str] = {}
 
-    @retryable
+    @retryable()
+    def prefetch(self, vpc_id: str) -> None:
+        """Load every existing subnet of a VPC in one call so ensure_subnet can skip per-CIDR lookups."""
+        subnets = self.ec2.describe_subnets(Filters=[{"Name": "vpc-id", "Values": [vpc_id]}]).get("Subnets", [])
+        self._subnets.update({(vpc_id, subnet["CidrBlock"]): subnet["SubnetId"] for subnet in subnets})
+
+    @retryable()
     def ensure_vpc(self, name: str, cidr: str, tags: Dict[str, str]) -> str:
         existing = self.ec2.describe_vpcs(Filters=[{"Name": "tag:Name", "Values": [name]}]).get("Vpcs")
         if existing:
@@ -91,7 +162,7 @@ class VPCManager:
         self.ec2.modify_vpc_attribute(VpcId=vpc_id, EnableDnsHostnames={"Value": True})
         return vpc_id
 
-    @retryable
+    @retryable()
     def ensure_internet_gateway(self, vpc_id: str, name: str, tags: Dict[str, str]) -> str:
         igws = self.ec2.describe_internet_gateways(Filters=[{"Name": "attachment.vpc-id", "Values": [vpc_id]}]).get("InternetGateways")
         if igws:
@@ -101,8 +172,10 @@ class VPCManager:
         self.ec2.attach_internet_gateway(InternetGatewayId=igw_id, VpcId=vpc_id)
         return igw_id
 
-    @retryable
+    @retryable()
     def ensure_subnet(self, name: str, vpc_id: str, cidr: str, az: str, public: bool, tags: Dict[str, str]) -> str:
+        if (vpc_id, cidr) in self._subnets:
+            return self._subnets[(vpc_id, cidr)]
         existing = self.ec2.describe_subnets(Filters=[
             {"Name": "vpc-id", "Values": [vpc_id]},
             {"Name": "cidr-block", "Values": [cidr]}
@@ -118,6 +191,7 @@ class VPCManager:
         subnet_id = subnet["Subnet"]["SubnetId"]
         if public:
             self.ec2.modify_subnet_attribute(SubnetId=subnet_id, MapPublicIpOnLaunch={"Value": True})
+        self._subnets[(vpc_id, cidr)] = subnet_id
         return subnet_id
 
 
@@ -125,7 +199,7 @@ class RouteTableManager:
     def __init__(self, ec2):
         self.ec2 = ec2
 
-    @retryable
+    @retryable()
     def ensure_route_table(self, vpc_id: str, name: str, tags: Dict[str, str]) -> str:
         existing = self.ec2.describe_route_tables(Filters=[
             {"Name": "vpc-id", "Values": [vpc_id]},
@@ -139,7 +213,7 @@ class RouteTableManager:
         )
         return response["RouteTable"]["RouteTableId"]
 
-    @retryable
+    @retryable()
     def ensure_route(self, route_table_id: str, destination_cidr: str, gateway_id: Optional[str] = None, nat_gateway_id: Optional[str] = None) -> None:
         params = {
             "RouteTableId": route_table_id,
@@ -155,7 +229,7 @@ class RouteTableManager:
             if exc.response["Error"]["Code"] != "RouteAlreadyExists":
                 raise
 
-    @retryable
+    @retryable()
     def associate(self, route_table_id: str, subnet_id: str) -> None:
         self.ec2.associate_route_table(RouteTableId=route_table_id, SubnetId=subnet_id)
 
@@ -164,7 +238,7 @@ class NATGatewayManager:
     def __init__(self, ec2):
         self.ec2 = ec2
 
-    @retryable
+    @retryable()
     def ensure_nat_gateway(self, subnet_id: str, name: str, tags: Dict[str, str]) -> str:
         eip = self.ec2.allocate_address(Domain="vpc", TagSpecifications=[{"ResourceType": "elastic-ip", "Tags": _tags(name, tags)}])
         nat = self.ec2.create_nat_gateway(
@@ -182,7 +256,7 @@ class SecurityGroupManager:
     def __init__(self, ec2):
         self.ec2 = ec2
 
-    @retryable
+    @retryable()
     def ensure_security_group(self, vpc_id: str, name: str, description: str, tags: Dict[str, str]) -> str:
         existing = self.ec2.describe_security_groups(Filters=[
             {"Name": "vpc-id", "Values": [vpc_id]},
@@ -223,7 +297,7 @@ class IAMManager:
     def __init__(self, iam):
         self.iam = iam
 
-    @retryable
+    @retryable()
     def ensure_instance_profile(self, name: str, role_name: str) -> str:
         try:
             self.iam.get_instance_profile(InstanceProfileName=name)
@@ -237,7 +311,7 @@ class LaunchTemplateManager:
     def __init__(self, ec2):
         self.ec2 = ec2
 
-    @retryable
+    @retryable()
     def ensure_launch_template(self, name: str, image_id: str, instance_type: str, iam_profile: str, security_group_ids: List[str], user_data: Optional[str], tags: Dict[str, str]) -> str:
         try:
             response = self.ec2.describe_launch_templates(Filters=[{"Name": "launch-template-name", "Values": [name]}])
@@ -269,7 +343,7 @@ class AutoScalingManager:
     def __init__(self, autoscaling):
         self.autoscaling = autoscaling
 
-    @retryable
+    @retryable()
     def ensure_auto_scaling_group(self, name: str, launch_template_id: str, subnets: List[str], desired: int, minimum: int, maximum: int, tags: Dict[str, str]) -> None:
         try:
             self.autoscaling.describe_auto_scaling_groups(AutoScalingGroupNames=[name])
@@ -290,7 +364,7 @@ class AutoScalingManager:
         else:
             self.autoscaling.create_auto_scaling_group(**params)
 
-    @retryable
+    @retryable()
     def ensure_target_tracking_policy(self, name: str, asg_name: str, target: float) -> None:
         self.autoscaling.put_scaling_policy(
             AutoScalingGroupName=asg_name,
@@ -307,24 +381,33 @@ class SecretsManager:
     def __init__(self, secrets_client):
         self.client = secrets_client
 
-    @retryable
     def fetch_credentials(self, secret_name: str, username_key: str, password_key: str) -> Dict[str, str]:
-        response = self.client.get_secret_value(SecretId=secret_name)
-        secret_string = response.get("SecretString")
-        if not secret_string:
-            raise ValueError(f"Secret {secret_name} does not contain SecretString")
-        secret = yaml.safe_load(secret_string)
+        cache_key = (self.client.meta.region_name, secret_name)
+        cached = _SECRET_CACHE.get(cache_key)
+        if cached is not None and cached[0] > time.monotonic():
+            secret = cached[1]
+        else:
+            secret = self._fetch_secret(secret_name)
+            _SECRET_CACHE[cache_key] = (time.monotonic() + SECRET_TTL_SECONDS, secret)
         return {
             "username": secret[username_key],
             "password": secret[password_key],
         }
 
+    @retryable()
+    def _fetch_secret(self, secret_name: str) -> Dict[str, Any]:
+        response = self.client.get_secret_value(SecretId=secret_name)
+        secret_string = response.get("SecretString")
+        if not secret_string:
+            raise ValueError(f"Secret {secret_name} does not contain SecretString")
+        return orjson.loads(secret_string)
+
 
 class RDSManager:
     def __init__(self, rds):
         self.rds = rds
 
-    @retryable
+    @retryable()
     def ensure_postgres(self, config: Dict[str, Any], subnet_group: str, security_group_id: str, credentials: Dict[str, str], tags: Dict[str, str]) -> str:
         identifier = config["identifier"]
         try:
@@ -360,11 +443,19 @@ class RDSManager:
 
 
 class S3Manager:
-    def __init__(self, s3):
+    def __init__(self, s3, sts=None, cache_path: str = KNOWN_BUCKETS_PATH):
         self.s3 = s3
+        self.sts = sts
+        self.cache_path = cache_path
+        self._cache_lock = threading.Lock()
+        self._account_lock = threading.Lock()
+        self._account_id: Optional[str] = None
 
-    @retryable
+    @retryable()
     def ensure_bucket(self, bucket: str, region: str) -> None:
+        if self._is_known_bucket(bucket):
+            LOGGER.info("Bucket %s seen within the last hour, skipping lookup", bucket)
+            return
         try:
             self.s3.head_bucket(Bucket=bucket)
             LOGGER.info("Bucket %s already exists", bucket)
@@ -378,6 +469,60 @@ class S3Manager:
                 self.s3.create_bucket(**params)
             else:
                 raise
+        self._remember_bucket(bucket)
+
+    def _account(self) -> Optional[str]:
+        # Resolved on first use so the STS call runs on a provisioning worker, not ahead of the pool.
+        if self.sts is None:
+            return None
+        with self._account_lock:
+            if self._account_id is None:
+                try:
+                    self._account_id = self.sts.get_caller_identity()["Account"]
+                except (ClientError, botocore.exceptions.BotoCoreError) as exc:
+                    LOGGER.warning("Could not resolve AWS account, bucket cache disabled: %s", exc)
+                    self.sts = None
+            return self._account_id
+
+    def _is_known_bucket(self, bucket: str) -> bool:
+        account_id = self._account()
+        if not account_id:
+            return False
+        with self._cache_lock:
+            seen_at = self._read_known_buckets().get(f"{account_id}/{bucket}")
+        return isinstance(seen_at, (int, float)) and time.time() - seen_at < KNOWN_BUCKETS_TTL_SECONDS
+
+    def _remember_bucket(self, bucket: str) -> None:
+        account_id = self._account()
+        if not account_id:
+            return
+        with self._cache_lock:
+            known = self._read_known_buckets()
+            known[f"{account_id}/{bucket}"] = time.time()
+            staging = None
+            try:
+                directory = os.path.dirname(self.cache_path)
+                os.makedirs(directory, exist_ok=True)
+                with tempfile.NamedTemporaryFile("wb", dir=directory, suffix=".tmp", delete=False) as handle:
+                    staging = handle.name
+                    handle.write(orjson.dumps(known))
+                os.replace(staging, self.cache_path)
+            except OSError as exc:
+                LOGGER.warning("Could not update bucket cache %s: %s", self.cache_path, exc)
+                if staging and os.path.exists(staging):
+                    os.remove(staging)
+
+    def _read_known_buckets(self) -> Dict[str, float]:
+        try:
+            with open(self.cache_path, "rb") as handle:
+                known = orjson.loads(handle.read())
+        except (OSError, orjson.JSONDecodeError):
+            return {}
+        return known if isinstance(known, dict) else {}
+
+    def ensure_versioned_bucket(self, bucket: str, region: str) -> None:
+        self.ensure_bucket(bucket, region)
+        self.enable_versioning(bucket)
 
     def enable_versioning(self, bucket: str) -> None:
         self.s3.put_bucket_versioning(Bucket=bucket, VersioningConfiguration={"Status": "Enabled"})
@@ -398,10 +543,25 @@ class S3Manager:
 
 
 def _tags(name: str, extra: Dict[str, str]) -> List[Dict[str, str]]:
-    tags = {"Name": name, **extra}
+    # The returned list is shared between callers; treat it as read-only.
+    return _tag_list(name, tuple(sorted(extra.items())))
+
+
+@functools.lru_cache(maxsize=None)
+def _tag_list(name: str, extra: Tuple[Tuple[str, str], ...]) -> List[Dict[str, str]]:
+    tags = {"Name": name, **dict(extra)}
     return [{"Key": k, "Value": v} for k, v in tags.items()]
 
 
+def _wait_all(pool: ThreadPoolExecutor, futures: List[Future]) -> None:
+    """Block until every future finishes, cancelling queued work on the first failure."""
+    done, _ = wait(futures, return_when=FIRST_EXCEPTION)
+    for future in done:
+        if future.exception() is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+            raise future.exception()
+
+
 def main(config_path: str = "config/base.yaml") -> None:
     config = load_config(config_path)
     project = config["project"]
@@ -413,24 +573,34 @@ def main(config_path: str = "config/base.yaml") -> None:
 
     vpc_manager = VPCManager(clients.ec2)
     vpc_id = vpc_manager.ensure_vpc(f"{project['name']}-{env}", config["network"]["vpc"]["cidr"], tags)
-    igw_id = vpc_manager.ensure_internet_gateway(vpc_id, f"{project['name']}-{env}-igw", tags)
-
-    azs = clients.ec2.describe_availability_zones(Filters=[{"Name": "region-name", "Values": [region]}])["AvailabilityZones"]
-    az_names = [az["ZoneName"] for az in azs][: config["network"]["vpc"]["az_count"]]
-    public_subnets = []
-    for cidr, az in zip(config["network"]["subnets"]["public"]["cidr_blocks"], az_names):
-        subnet_id = vpc_manager.ensure_subnet(f"public-{az}", vpc_id, cidr, az, True, {**tags, "Tier": "public"})
-        public_subnets.append(subnet_id)
-    private_subnets = []
-    for cidr, az in zip(config["network"]["subnets"]["private"]["cidr_blocks"], az_names):
-        subnet_id = vpc_manager.ensure_subnet(f"private-{az}", vpc_id, cidr, az, False, {**tags, "Tier": "private"})
-        private_subnets.append(subnet_id)
-
-    s3_manager = S3Manager(clients.s3)
-    s3_manager.ensure_bucket(config["s3"]["raw_bucket"], region)
-    s3_manager.enable_versioning(config["s3"]["raw_bucket"])
-    s3_manager.ensure_bucket(config["s3"]["curated_bucket"], region)
-    s3_manager.enable_versioning(config["s3"]["curated_bucket"])
+    s3_manager = S3Manager(clients.s3, sts=clients.sts)
+    public_tags = {**tags, "Tier": "public"}
+    private_tags = {**tags, "Tier": "private"}
+
+    # Everything below only depends on the VPC, so the API calls can overlap.
+    with ThreadPoolExecutor(max_workers=PROVISIONING_WORKERS) as pool:
+        igw_future = pool.submit(vpc_manager.ensure_internet_gateway, vpc_id, f"{project['name']}-{env}-igw", tags)
+        bucket_futures = [
+            pool.submit(s3_manager.ensure_versioned_bucket, bucket, region)
+            for bucket in (config["s3"]["raw_bucket"], config["s3"]["curated_bucket"])
+        ]
+        vpc_manager.prefetch(vpc_id)
+
+        azs = clients.ec2.describe_availability_zones(Filters=[{"Name": "region-name", "Values": [region]}])["AvailabilityZones"]
+        az_names = [az["ZoneName"] for az in azs][: config["network"]["vpc"]["az_count"]]
+        public_futures = [
+            pool.submit(vpc_manager.ensure_subnet, f"public-{az}", vpc_id, cidr, az, True, public_tags)
+            for cidr, az in zip(config["network"]["subnets"]["public"]["cidr_blocks"], az_names)
+        ]
+        private_futures = [
+            pool.submit(vpc_manager.ensure_subnet, f"private-{az}", vpc_id, cidr, az, False, private_tags)
+            for cidr, az in zip(config["network"]["subnets"]["private"]["cidr_blocks"], az_names)
+        ]
+        _wait_all(pool, [igw_future, *bucket_futures, *public_futures, *private_futures])
+
+    igw_id = igw_future.result()
+    public_subnets = [future.result() for future in public_futures]
+    private_subnets = [future.result() for future in private_futures]
 
     table = Table(title="Provisioned Artefacts")
     table.add_column("Resource")
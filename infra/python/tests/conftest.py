@@ -0,0 +1,5 @@
+import os
+import sys
+
+# infra_deployer is run as a script from infra/python rather than installed as a package.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,256 @@
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from unittest import mock
+
+import pytest
+from botocore.exceptions import ClientError
+
+import infra_deployer
+
+
+@pytest.fixture(autouse=True)
+def clear_secret_cache():
+    infra_deployer._SECRET_CACHE.clear()
+
+
+def _client_error(code: str, status: int = 400) -> ClientError:
+    return ClientError({"Error": {"Code": code}, "ResponseMetadata": {"HTTPStatusCode": status}}, "Operation")
+
+
+def test_retryable_passes_caller_kwargs_through():
+    @infra_deployer.retryable()
+    def create(name, max_attempts=None, backoff_seconds=None):
+        return name, max_attempts, backoff_seconds
+
+    assert create("vpc", max_attempts=7, backoff_seconds=3) == ("vpc", 7, 3)
+
+
+@mock.patch("infra_deployer.time.sleep")
+def test_retryable_does_not_retry_validation_errors(mock_sleep):
+    func = mock.Mock(side_effect=_client_error("ValidationError"), __name__="func")
+
+    with pytest.raises(ClientError):
+        infra_deployer.retryable(max_attempts=5)(func)()
+
+    assert func.call_count == 1
+    mock_sleep.assert_not_called()
+
+
+@mock.patch("infra_deployer.random.uniform", return_value=0.0)
+@mock.patch("infra_deployer.time.sleep")
+def test_retryable_backs_off_exponentially_up_to_cap(mock_sleep, mock_uniform):
+    func = mock.Mock(side_effect=_client_error("ThrottlingException"), __name__="func")
+
+    with pytest.raises(ClientError):
+        infra_deployer.retryable(max_attempts=5, base=1, cap=3)(func)()
+
+    assert func.call_count == 5
+    assert [call.args[0] for call in mock_sleep.call_args_list] == [1, 2, 3, 3]
+
+
+@mock.patch("infra_deployer.time.sleep")
+def test_retryable_retries_eventual_consistency_not_found(mock_sleep):
+    func = mock.Mock(side_effect=[_client_error("InvalidSubnetID.NotFound"), "subnet-1"], __name__="func")
+
+    assert infra_deployer.retryable()(func)() == "subnet-1"
+    assert func.call_count == 2
+
+
+@pytest.fixture
+def sts():
+    client = mock.Mock()
+    client.get_caller_identity.return_value = {"Account": "123456789012"}
+    return client
+
+
+def test_ensure_bucket_skips_head_for_recently_seen_bucket(tmp_path, sts):
+    s3 = mock.Mock()
+    cache_path = str(tmp_path / "cache" / "known_buckets.json")
+
+    infra_deployer.S3Manager(s3, sts=sts, cache_path=cache_path).ensure_bucket("raw", "eu-north-1")
+    infra_deployer.S3Manager(s3, sts=sts, cache_path=cache_path).ensure_bucket("raw", "eu-north-1")
+
+    assert s3.head_bucket.call_count == 1
+    assert list(tmp_path.joinpath("cache").iterdir()) == [tmp_path / "cache" / "known_buckets.json"]
+
+
+def test_ensure_bucket_rechecks_after_ttl(tmp_path, sts):
+    s3 = mock.Mock()
+    manager = infra_deployer.S3Manager(s3, sts=sts, cache_path=str(tmp_path / "known_buckets.json"))
+
+    with mock.patch("infra_deployer.time.time", return_value=1_000_000.0):
+        manager.ensure_bucket("raw", "eu-north-1")
+    with mock.patch("infra_deployer.time.time", return_value=1_000_000.0 + infra_deployer.KNOWN_BUCKETS_TTL_SECONDS + 1):
+        manager.ensure_bucket("raw", "eu-north-1")
+
+    assert s3.head_bucket.call_count == 2
+
+
+def test_ensure_bucket_without_account_never_caches(tmp_path):
+    s3 = mock.Mock()
+    cache_path = tmp_path / "known_buckets.json"
+    manager = infra_deployer.S3Manager(s3, cache_path=str(cache_path))
+
+    manager.ensure_bucket("raw", "eu-north-1")
+    manager.ensure_bucket("raw", "eu-north-1")
+
+    assert s3.head_bucket.call_count == 2
+    assert not cache_path.exists()
+
+
+def test_ensure_bucket_tolerates_unwritable_cache_dir(tmp_path, sts):
+    s3 = mock.Mock()
+    blocker = tmp_path / "not-a-dir"
+    blocker.write_text("")
+    manager = infra_deployer.S3Manager(s3, sts=sts, cache_path=str(blocker / "known_buckets.json"))
+
+    manager.ensure_bucket("raw", "eu-north-1")
+    manager.ensure_bucket("raw", "eu-north-1")
+
+    assert s3.head_bucket.call_count == 2
+
+
+def test_ensure_bucket_ignores_non_mapping_cache(tmp_path, sts):
+    s3 = mock.Mock()
+    cache_path = tmp_path / "known_buckets.json"
+    cache_path.write_text("[1, 2]")
+
+    infra_deployer.S3Manager(s3, sts=sts, cache_path=str(cache_path)).ensure_bucket("raw", "eu-north-1")
+
+    assert s3.head_bucket.call_count == 1
+    assert "123456789012/raw" in cache_path.read_text()
+
+
+def test_fetch_credentials_is_cached_until_ttl_expires():
+    client = mock.Mock()
+    client.meta.region_name = "eu-north-1"
+    client.get_secret_value.return_value = {"SecretString": '{"username": "admin", "password": "s3cret"}'}
+    secrets = infra_deployer.SecretsManager(client)
+
+    with mock.patch("infra_deployer.time.monotonic", return_value=1000.0):
+        assert secrets.fetch_credentials("rds/secret", "username", "password") == {"username": "admin", "password": "s3cret"}
+        assert infra_deployer.SecretsManager(client).fetch_credentials("rds/secret", "username", "password")["password"] == "s3cret"
+    assert client.get_secret_value.call_count == 1
+
+    with mock.patch("infra_deployer.time.monotonic", return_value=1000.0 + infra_deployer.SECRET_TTL_SECONDS + 1):
+        secrets.fetch_credentials("rds/secret", "username", "password")
+    assert client.get_secret_value.call_count == 2
+
+
+@mock.patch("infra_deployer.time.sleep")
+def test_fetch_credentials_retries_throttled_fetch(mock_sleep):
+    client = mock.Mock()
+    client.meta.region_name = "eu-north-1"
+    client.get_secret_value.side_effect = [
+        _client_error("ThrottlingException"),
+        {"SecretString": '{"username": "admin", "password": "s3cret"}'},
+    ]
+
+    credentials = infra_deployer.SecretsManager(client).fetch_credentials("rds/secret", "username", "password")
+
+    assert credentials["username"] == "admin"
+    assert client.get_secret_value.call_count == 2
+
+
+def test_ensure_subnet_uses_prefetched_subnets():
+    ec2 = mock.Mock()
+    ec2.describe_subnets.return_value = {"Subnets": [{"CidrBlock": "10.10.1.0/24", "SubnetId": "subnet-known"}]}
+    manager = infra_deployer.VPCManager(ec2)
+    manager.prefetch("vpc-1")
+    ec2.describe_subnets.reset_mock()
+
+    assert manager.ensure_subnet("public-a", "vpc-1", "10.10.1.0/24", "eu-north-1a", True, {}) == "subnet-known"
+    ec2.describe_subnets.assert_not_called()
+    ec2.create_subnet.assert_not_called()
+
+
+def test_ensure_subnet_falls_back_and_caches_per_vpc():
+    ec2 = mock.Mock()
+    ec2.describe_subnets.return_value = {"Subnets": [{"CidrBlock": "10.10.1.0/24", "SubnetId": "subnet-known"}]}
+    manager = infra_deployer.VPCManager(ec2)
+    manager.prefetch("vpc-1")
+    ec2.describe_subnets.reset_mock()
+    ec2.describe_subnets.return_value = {"Subnets": []}
+    ec2.create_subnet.return_value = {"Subnet": {"SubnetId": "subnet-new"}}
+
+    # Same CIDR in a different VPC must not reuse vpc-1's subnet.
+    assert manager.ensure_subnet("private-a", "vpc-2", "10.10.1.0/24", "eu-north-1a", False, {}) == "subnet-new"
+    assert ec2.describe_subnets.call_count == 1
+    ec2.create_subnet.assert_called_once()
+    ec2.modify_subnet_attribute.assert_not_called()
+
+    assert manager.ensure_subnet("private-a", "vpc-2", "10.10.1.0/24", "eu-north-1a", False, {}) == "subnet-new"
+    assert ec2.describe_subnets.call_count == 1
+    ec2.create_subnet.assert_called_once()
+
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config", "base.yaml")
+
+
+@pytest.fixture
+def clients():
+    ec2 = mock.Mock()
+    ec2.describe_vpcs.return_value = {"Vpcs": [{"VpcId": "vpc-1"}]}
+    ec2.describe_internet_gateways.return_value = {"InternetGateways": [{"InternetGatewayId": "igw-1"}]}
+    ec2.describe_subnets.return_value = {"Subnets": []}
+    ec2.describe_availability_zones.return_value = {"AvailabilityZones": [{"ZoneName": "eu-north-1a"}, {"ZoneName": "eu-north-1b"}]}
+
+    def create_subnet(CidrBlock, **kwargs):
+        if CidrBlock == "10.10.1.0/24":
+            time.sleep(0.05)  # finish last; reported order must still follow the config
+        return {"Subnet": {"SubnetId": f"subnet-{CidrBlock}"}}
+
+    ec2.create_subnet.side_effect = create_subnet
+    aws = infra_deployer.AWSClients(
+        ec2=ec2, autoscaling=mock.Mock(), rds=mock.Mock(), s3=mock.Mock(), iam=mock.Mock(), secretsmanager=mock.Mock(), sts=None,
+    )
+    with mock.patch("infra_deployer.init_clients", return_value=aws):
+        yield aws
+
+
+@mock.patch("infra_deployer.console")
+@mock.patch("infra_deployer.Table")
+def test_main_provisions_concurrently_and_reports_in_config_order(mock_table, mock_console, clients):
+    infra_deployer.main(CONFIG_PATH)
+
+    rows = dict(call.args for call in mock_table.return_value.add_row.call_args_list)
+    assert rows == {
+        "VPC": "vpc-1",
+        "InternetGateway": "igw-1",
+        "PublicSubnets": "subnet-10.10.1.0/24, subnet-10.10.2.0/24",
+        "PrivateSubnets": "subnet-10.10.11.0/24, subnet-10.10.12.0/24",
+    }
+    versioned = sorted(call.kwargs["Bucket"] for call in clients.s3.put_bucket_versioning.call_args_list)
+    assert versioned == ["northwind-data-curated-eu-north-1-dev", "northwind-data-raw-eu-north-1-dev"]
+    mock_console.print.assert_called_once()
+
+
+@mock.patch("infra_deployer.console")
+def test_main_reraises_first_provisioning_failure(mock_console, clients):
+    clients.s3.head_bucket.side_effect = _client_error("AccessDenied", 403)
+
+    with pytest.raises(ClientError, match="AccessDenied"):
+        infra_deployer.main(CONFIG_PATH)
+
+    clients.s3.put_bucket_versioning.assert_not_called()
+    mock_console.print.assert_not_called()
+
+
+def test_wait_all_cancels_queued_work_on_first_failure():
+    pool = ThreadPoolExecutor(max_workers=1)
+    release = threading.Event()
+    ran = []
+    running = pool.submit(release.wait)
+    queued = pool.submit(ran.append, "queued")
+    failed = Future()
+    failed.set_exception(ValueError("boom"))
+    threading.Timer(0.05, release.set).start()
+
+    with pytest.raises(ValueError, match="boom"):
+        infra_deployer._wait_all(pool, [running, queued, failed])
+
+    assert queued.cancelled()
+    assert ran == []
+    assert running.done()